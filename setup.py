@@ -8,6 +8,13 @@ setuptools.setup(
     description="A simple API library for the Visonic/Bentel/Tyco Alarm system.",
     url="https://github.com/And3rsL/VisonicAlarm2",
     packages=setuptools.find_packages(),
+    python_requires=">=3.10",
+    install_requires=[
+        "requests",
+        "python-dateutil",
+        "orjson",
+        "ijson",
+    ],
     classifiers=[
         "Programming Language :: Python :: 3",
         "License :: OSI Approved :: MIT License",
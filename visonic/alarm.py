@@ -1,97 +1,136 @@
 import json
 import requests
 import logging
-import sched
+import sys
 import threading
 import time
-from dateutil.relativedelta import *
+import urllib3
 
-from datetime import datetime
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from http.cookiejar import DefaultCookiePolicy
 from dateutil import parser
+from operator import itemgetter
 from threading import Event
-
-class Device(object):
+from requests.adapters import HTTPAdapter
+from urllib3.util.request import ACCEPT_ENCODING
+from urllib3.util.retry import Retry
+
+# Use orjson when it is available, it parses bytes directly and is a lot
+# faster than the standard library.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+if orjson is not None:
+    _json_loads = orjson.loads
+    _json_dumps = orjson.dumps
+
+    def _json_response(response):
+        """ Parse the JSON body of response straight from the raw bytes. """
+        return orjson.loads(response.content)
+else:
+    _json_loads = json.loads
+
+    def _json_response(response):
+        """ Parse the JSON body of response. """
+        return response.json()
+
+    def _json_dumps(obj):
+        """ Serialize obj to compact JSON bytes. """
+        return json.dumps(obj, separators=(',', ':')).encode('utf-8')
+
+# Use ijson when it is available to parse large lists while they are
+# being received instead of loading the whole response first.
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+# Errors raised while a response is read and parsed. requests doesn't wrap
+# the body errors of a streamed response since it doesn't read it itself,
+# and a body that is not valid JSON raises a ValueError.
+_RESPONSE_ERRORS = (requests.exceptions.RequestException, urllib3.exceptions.HTTPError, ValueError)
+if ijson is not None:
+    _RESPONSE_ERRORS += (ijson.JSONError,)
+
+# Sessions shared by all API instances, keyed by hostname. The tokens are
+# sent per request and cookies are refused, so a session can safely be used
+# by several instances logged in with different accounts.
+_SHARED_SESSIONS = {}
+_SHARED_SESSIONS_LOCK = threading.Lock()
+
+def _get_session(hostname, user_agent):
+    """ Get the shared session for hostname, creating it on first use. """
+    with _SHARED_SESSIONS_LOCK:
+        session = _SHARED_SESSIONS.get(hostname)
+        if session is None:
+            # The headers are the same for every request so set them once
+            session = requests.Session()
+            session.verify = True
+
+            # The API authenticates with tokens only, never keep cookies since
+            # the cookie jar would be shared by every account on this host.
+            session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+            session.headers.update({
+                'Host': hostname,
+                'Connection': 'keep-alive',
+                'Accept': '*/*',
+                'User-Agent': user_agent,
+                'Accept-Language': 'en-us',
+                'Accept-Encoding': ACCEPT_ENCODING
+            })
+
+            # Keep a small pool of connections to the server and retry on
+            # connection errors and temporary server errors. Retry-After is
+            # ignored since the server could make a request sleep for hours,
+            # the short backoff is used instead.
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=4,
+                                  max_retries=Retry(total=3, backoff_factor=0.3,
+                                                    status_forcelist=(500, 502, 503, 504),
+                                                    allowed_methods=frozenset(['GET', 'POST']),
+                                                    respect_retry_after_header=False,
+                                                    raise_on_status=False))
+            session.mount('https://', adapter)
+
+            _SHARED_SESSIONS[hostname] = session
+        return session
+
+@dataclass(frozen=True, slots=True, eq=False)
+class Device:
     """ Base class definition of a device in the alarm system. """
 
-    # Property variables
-    __id = None
-    __name = None
-    __zone = None
-    __device_type = None
-    __subtype = None
-    __preenroll = None
-    __warnings = None
-    __partitions = None
-
-    def __init__(self, id, name, zone, device_type, subtype,
-                 preenroll, warnings, partitions):
-        """ Set the private variable values on instantiation. """
-
-        self.__id = id
-        self.__name = name
-        self.__zone = zone
-        self.__device_type = device_type
-        self.__subtype = subtype
-        self.__preenroll = preenroll
-        self.__warnings = warnings
-        self.__partitions = partitions
-
-    # Device properties
-    @property
-    def id(self):
-        """ Device ID. """
-        return self.__id
-
-    @property
-    def name(self):
-        """ Device Name. """
-        return self.__name
-
-    @property
-    def zone(self):
-        """ Device zone. """
-        return self.__zone
-
-    @property
-    def device_type(self):
-        """ Device: device type. """
-        return self.__device_type
-
-    @property
-    def subtype(self):
-        """ Device subtype. """
-        return self.__subtype
-
-    @property
-    def pre_enroll(self):
-        """ Device pre_enroll. """
-        return self.__preenroll
-
-    @property
-    def warnings(self):
-        """ Device alarm count. """
-        return self.__warnings
-
-    @property
-    def partitions(self):
-        """ Device partitions. """
-        return self.__partitions
+    id: str
+    name: str
+    zone: str
+    device_type: str
+    subtype: str
+    pre_enroll: bool
+    warnings: object
+    partitions: object
 
 
+@dataclass(frozen=True, slots=True, eq=False)
 class ContactDevice(Device):
     """ Contact device class definition. """
 
+    is_opened: bool = field(init=False)
+
+    def __post_init__(self):
+        """ Determine once if the contact is opened, the warnings
+        never change during the life of the device. """
+        object.__setattr__(self, 'is_opened',
+                           bool(self.warnings) and 'OPENED' in str(self.warnings))
+
     @property
     def state(self):
         """ Returns the current state of the contact. """
-        if self.warnings:
-            if 'OPENED' in str(self.warnings):
-                return 'opened'
-            else:
-                return 'closed'
-        else:
-            return 'closed'
+        return 'opened' if self.is_opened else 'closed'
 
+@dataclass(frozen=True, slots=True, eq=False)
 class CameraDevice(Device):
     """ Camera device class definition. """
 
@@ -100,6 +139,7 @@ class CameraDevice(Device):
         """ Returns the current state of the camera. """
         return 'UKNOWN'
 
+@dataclass(frozen=True, slots=True, eq=False)
 class SmokeDevice(Device):
     """ Smoke device class definition. """
 
@@ -108,6 +148,7 @@ class SmokeDevice(Device):
         """ Returns the current state of the smoke. """
         return 'UKNOWN'
 
+@dataclass(frozen=True, slots=True, eq=False)
 class MotionDevice(Device):
     """ Motion device class definition. """
 
@@ -116,6 +157,7 @@ class MotionDevice(Device):
         """ Returns the current state of the motion. """
         return 'UKNOWN'
 
+@dataclass(frozen=True, slots=True, eq=False)
 class GenericDevice(Device):
     """ Generic device class definition. """
 
@@ -124,6 +166,41 @@ class GenericDevice(Device):
         """ Returns the current state of the motion. """
         return 'UKNOWN'
 
+# Event action by event type ID
+_ACTION_BY_TYPE_ID = {
+    89: 'Disarm',
+    85: 'ArmHome',
+    86: 'ArmAway',
+    2: 'Alarm'
+}
+
+# Get the values of a device in the API response, in Device field order
+_device_fields = itemgetter('id', 'name', 'zone_type', 'device_type', 'subtype',
+                            'preenroll', 'warnings', 'partitions')
+
+# Device class by device subtype
+_DEVICE_CLASS_BY_SUBTYPE = {
+    'CONTACT': ContactDevice,
+    'CONTACT_AUX': ContactDevice,
+    'MOTION_CAMERA': CameraDevice,
+    'MOTION': MotionDevice,
+    'CURTAIN': MotionDevice,
+    'SMOKE': SmokeDevice
+}
+
+# Extra lines printed by print_system_devices by device class
+_DETAIL_LINES = {
+    ContactDevice: lambda device: (f'State:          {device.state}',)
+}
+
+def _device_class(subtype):
+    """ Get the device class to use for a device subtype. """
+    device_class = _DEVICE_CLASS_BY_SUBTYPE.get(subtype)
+    if device_class is None:
+        # Other contact subtypes are still contacts
+        device_class = ContactDevice if 'CONTACT' in subtype else GenericDevice
+    return device_class
+
 class System(object):
     """ Class definition of the main alarm system. """
 
@@ -140,11 +217,24 @@ class System(object):
     __system_connected = False
     __system_alarm = False
     __system_devices = []
+    __device_by_id = {}
 
     def __init__(self, hostname, app_id, user_code, user_email, user_password, panel_id, partition):
         """ Initiate the connection to the Visonic API """
         self.__api = API(hostname, app_id, user_code, user_email, user_password, panel_id, partition)
 
+        # Devices of this system, and the same devices indexed by their ID
+        self.__system_devices = []
+        self.__device_by_id = {}
+        self.__devices_lock = threading.Lock()
+
+        # Background polling
+        self.__poll_thread = None
+        self.__poll_stop = Event()
+
+        # Worker used to overlap independent API requests
+        self.__executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='visonic')
+
     # System properties
     @property
     def serial_number(self):
@@ -175,7 +265,7 @@ class System(object):
     @property
     def is_token_valid(self):
         """ If the alarm system is active or not. """
-        return self.__api.is_logged_in
+        return self.__api.is_logged_in()
 
     @property
     def session_token(self):
@@ -194,10 +284,40 @@ class System(object):
 
     def get_device_by_id(self, id):
         """ Get a device by its ID. """
-        for device in self.__system_devices:
-            if device.id == id:
-                return device
-        return None
+        return self.__device_by_id.get(id)
+
+    def start_polling(self, interval=5):
+        """ Refresh the status and the devices every interval seconds in a
+        background thread, the properties then return the last known values
+        without waiting for the server. """
+        if self.__poll_thread is not None and self.__poll_thread.is_alive():
+            return
+
+        self.__poll_stop.clear()
+        self.__poll_thread = threading.Thread(target=self.__poll_loop, args=(interval,),
+                                              name='visonic-poll', daemon=True)
+        self.__poll_thread.start()
+
+    def stop_polling(self):
+        """ Stop the background polling started by start_polling(). """
+        self.__poll_stop.set()
+        if self.__poll_thread is not None:
+            self.__poll_thread.join()
+            self.__poll_thread = None
+
+    def __poll_loop(self, interval):
+        """ Refresh the status and the devices every interval seconds
+        until polling is stopped. """
+
+        # Waiting on the stop event lets stop_polling() interrupt the delay
+        while not self.__poll_stop.is_set():
+            try:
+                self.update_status()
+                self.update_devices()
+            except Exception:
+                logging.exception('Polling the alarm system failed')
+
+            self.__poll_stop.wait(interval)
 
     def disarm(self):
         """ Send Disarm command to the alarm system. """
@@ -215,7 +335,10 @@ class System(object):
         """ Connect to the alarm system and get the static system info. """
 
         # Check that the server support API version 4.0 or 8.0.
-        rest_versions = self.__api.get_version_info()['rest_versions']
+        version_info = self.__api.get_version_info()
+        if version_info is None:
+            raise requests.exceptions.RequestException('Failed to get the supported Rest API versions')
+        rest_versions = version_info['rest_versions']
 
         if '8.0' in rest_versions:
             print('Rest API version 8.0 is supported.')
@@ -239,19 +362,22 @@ class System(object):
         self.__api.panel_login()
         logging.debug('Panel Login successful')
 
-        # Get general panel information
-        gpi = self.__api.get_panel_info()
+        # Get general panel information while the status is being updated
+        gpi_future = self.__executor.submit(self.__api.get_panel_info)
+        self.update_status()
+
+        gpi = gpi_future.result()
+        if gpi is None:
+            raise requests.exceptions.RequestException('Failed to get the panel information')
         self.__system_serial = gpi['serial']
         self.__system_model = gpi['model']
 
-        self.update_status()
-
     def get_last_event(self, timestamp_hour_offset=0):
         """ Get the last event. """
 
         events = self.__api.get_events()
 
-        if events is None:
+        if not events:
             return None
         else:
             last_event = events[-1]
@@ -261,24 +387,19 @@ class System(object):
             data['event_id'] = last_event['event']
 
             # Determine the arm state.
-            if last_event['type_id'] == 89:
-                data['action'] = 'Disarm'
-            elif last_event['type_id'] == 85:
-                data['action'] = 'ArmHome'
-            elif last_event['type_id'] == 86:
-                data['action'] = 'ArmAway'
-            elif last_event['type_id'] == 2:
-                data['action'] = 'Alarm'
-            else:
-                data['action'] = 'Unknown type_id: {0}'.format(
-                    str(last_event['type_id']))
+            type_id = last_event['type_id']
+            data['action'] = _ACTION_BY_TYPE_ID.get(type_id) or f'Unknown type_id: {type_id}'
 
             # User that caused the event
             data['user'] = last_event['appointment']
 
             # Event timestamp
-            dt = parser.parse(last_event['datetime'])
-            dt = dt + relativedelta(hours=timestamp_hour_offset)
+            try:
+                dt = datetime.fromisoformat(last_event['datetime'].replace('Z', '+00:00'))
+            except ValueError:
+                # Not an ISO 8601 timestamp, let dateutil figure it out
+                dt = parser.parse(last_event['datetime'])
+            dt = dt + timedelta(hours=timestamp_hour_offset)
             timestamp = dt.strftime('%Y-%m-%d %H:%M:%S')
             data['timestamp'] = timestamp
 
@@ -287,82 +408,106 @@ class System(object):
     def print_system_information(self):
         """ Print system information. """
 
-        print()
-        print('---------------------------------')
-        print(' Connection specific information ')
-        print('---------------------------------')
-        print('Host:          {0}'.format(self.__api.hostname))
-        print('User Code:     {0}'.format(self.__api.user_code))
-        print('App ID:       {0}'.format(self.__api.app_id))
-        print('Panel ID:      {0}'.format(self.__api.panel_id))
-        print('Partition:     {0}'.format(self.__api.partition))
-        print('Session-Token: {0}'.format(self.__api.session_token))
-        print('User-Token: {0}'.format(self.__api.user_token))
-        print()
-        print('----------------------------')
-        print(' General system information ')
-        print('----------------------------')
-        print('Serial:       {0}'.format(self.__system_serial))
-        print('Model:        {0}'.format(self.__system_model))
-        print('Ready:        {0}'.format(self.__system_ready))
-        print('State:        {0}'.format(self.__system_state))
-        print('Connected:    {0}'.format(self.__system_connected))
+        lines = [
+            '',
+            '---------------------------------',
+            ' Connection specific information ',
+            '---------------------------------',
+            f'Host:          {self.__api.hostname}',
+            f'User Code:     {self.__api.user_code}',
+            f'App ID:       {self.__api.app_id}',
+            f'Panel ID:      {self.__api.panel_id}',
+            f'Partition:     {self.__api.partition}',
+            f'Session-Token: {self.__api.session_token}',
+            f'User-Token: {self.__api.user_token}',
+            '',
+            '----------------------------',
+            ' General system information ',
+            '----------------------------',
+            f'Serial:       {self.__system_serial}',
+            f'Model:        {self.__system_model}',
+            f'Ready:        {self.__system_ready}',
+            f'State:        {self.__system_state}',
+            f'Connected:    {self.__system_connected}'
+        ]
+        sys.stdout.write('\n'.join(lines) + '\n')
 
     def print_system_devices(self, detailed=False):
         """ Print information about the devices in the alarm system. """
 
-        for index, device in enumerate(self.__system_devices):
-            print()
-            print('--------------')
-            print(' Device #{0} '.format(index+1))
-            print('--------------')
-            print('ID:             {0}'.format(device.id))
-            print('Name:           {0}'.format(device.name))
-            print('Zone:           {0}'.format(device.zone))
-            print('Device Type:    {0}'.format(device.device_type))
-            print('Subtype:        {0}'.format(device.subtype))
-            print('Warnings:       {0}'.format(device.warnings))
+        with self.__devices_lock:
+            devices = list(self.__system_devices)
+
+        lines = []
+        for index, device in enumerate(devices):
+            lines.append('')
+            lines.append('--------------')
+            lines.append(f' Device #{index+1} ')
+            lines.append('--------------')
+            lines.append(f'ID:             {device.id}')
+            lines.append(f'Name:           {device.name}')
+            lines.append(f'Zone:           {device.zone}')
+            lines.append(f'Device Type:    {device.device_type}')
+            lines.append(f'Subtype:        {device.subtype}')
+            lines.append(f'Warnings:       {device.warnings}')
 
             if detailed:
-                print('Pre-enroll:     {0}'.format(device.pre_enroll))
-                print('Partitions:     {0}'.format(device.partitions))
-            if isinstance(device, ContactDevice):
-                print('State:          {0}'.format(device.state))
+                lines.append(f'Pre-enroll:     {device.pre_enroll}')
+                lines.append(f'Partitions:     {device.partitions}')
+
+            detail_lines = _DETAIL_LINES.get(type(device))
+            if detail_lines is not None:
+                lines.extend(detail_lines(device))
+
+        if lines:
+            sys.stdout.write('\n'.join(lines) + '\n')
 
     def print_events(self):
         """ Print a list of all recent events. """
 
         events = self.__api.get_events()
 
+        lines = []
         for index, event in enumerate(events):
-            print()
-            print('--------------')
-            print(' Event #{0} '.format(index+1))
-            print('--------------')
-            print('Event:         {0}'.format(event['event']))
-            print('Type ID:       {0}'.format(event['type_id']))
-            print('Label:         {0}'.format(event['label']))
-            print('Description:   {0}'.format(event['description']))
-            print('Appointment:   {0}'.format(event['appointment']))
-            print('Datetime:      {0}'.format(event['datetime']))
-            print('Video:         {0}'.format(event['video']))
-            print('Device Type:   {0}'.format(event['device_type']))
-            print('Zone:          {0}'.format(event['zone']))
-            print('Partitions:    {0}'.format(event['partitions']))
+            lines.append('')
+            lines.append('--------------')
+            lines.append(f' Event #{index+1} ')
+            lines.append('--------------')
+            lines.append(f'Event:         {event["event"]}')
+            lines.append(f'Type ID:       {event["type_id"]}')
+            lines.append(f'Label:         {event["label"]}')
+            lines.append(f'Description:   {event["description"]}')
+            lines.append(f'Appointment:   {event["appointment"]}')
+            lines.append(f'Datetime:      {event["datetime"]}')
+            lines.append(f'Video:         {event["video"]}')
+            lines.append(f'Device Type:   {event["device_type"]}')
+            lines.append(f'Zone:          {event["zone"]}')
+            lines.append(f'Partitions:    {event["partitions"]}')
+
+        if lines:
+            sys.stdout.write('\n'.join(lines) + '\n')
 
     def update_status(self):
         """ Update all variables that are populated by the call
         to the status() API method. """
-    
-        status = self.__api.get_status()
+
+        # Fetch the status and the alarms concurrently, the requests are
+        # independent so there is no need to wait for one before the other.
+        status_future = self.__executor.submit(self.__api.get_status)
+        alarms_events = self.__api.get_alarms()
+        status = status_future.result()
+
+        # A failed request is not the same as no alarms, keep the current
+        # state rather than clearing an alarm that may still be active.
+        if status is None or alarms_events is None:
+            raise requests.exceptions.RequestException('Failed to get the alarm system status')
+
         partition = status['partitions'][0]
 
         self.__system_ready = partition['ready']
         self.__system_connected = status['connected']
 
-        alarms_events = self.__api.get_alarms()
-
-        if alarms_events is None or len(alarms_events) == 0:
+        if len(alarms_events) == 0:
             if partition['status'] == 'EXIT' and (partition['state'] == 'AWAY' or partition['state'] == 'HOME'):
                 self.__system_state = 'ARMING'
             else:
@@ -385,76 +530,25 @@ class System(object):
         self.__system_troubles = troubles
 
     def update_devices(self):
-        """ Update all devices in the system with fresh information. """
-
-        devices = self.__api.get_all_devices()
-
-        # Clear the list since there is no way to uniquely identify the devices.
-        self.__system_devices.clear()
-
-        for device in devices:
-            if device is not None:
-                if device['subtype'] is not None:
-                    if 'CONTACT' in device['subtype']:
-                        contact_device = ContactDevice(
-                            id=device['id'],
-                            name=device['name'],
-                            zone=device['zone_type'],
-                            device_type=device['device_type'],
-                            subtype=device['subtype'],
-                            preenroll=device['preenroll'],
-                            warnings=device['warnings'],
-                            partitions=device['partitions']
-                        )
-                        self.__system_devices.append(contact_device)
-                    elif device['subtype'] == 'MOTION_CAMERA':
-                        camera_device = CameraDevice(
-                            id=device['id'],
-                            name=device['name'],
-                            zone=device['zone_type'],
-                            device_type=device['device_type'],
-                            subtype=device['subtype'],
-                            preenroll=device['preenroll'],
-                            warnings=device['warnings'],
-                            partitions=device['partitions']
-                        )
-                        self.__system_devices.append(camera_device)
-                    elif device['subtype'] == 'MOTION' or device['subtype'] == 'CURTAIN':
-                        motion_device = MotionDevice(
-                            id=device['id'],
-                            name=device['name'],
-                            zone=device['zone_type'],
-                            device_type=device['device_type'],
-                            subtype=device['subtype'],
-                            preenroll=device['preenroll'],
-                            warnings=device['warnings'],
-                            partitions=device['partitions']
-                        )
-                        self.__system_devices.append(motion_device)
-                    elif device['subtype'] == 'SMOKE':
-                        smoke_device = SmokeDevice(
-                            id=device['id'],
-                            name=device['name'],
-                            zone=device['zone_type'],
-                            device_type=device['device_type'],
-                            subtype=device['subtype'],
-                            preenroll=device['preenroll'],
-                            warnings=device['warnings'],
-                            partitions=device['partitions']
-                        )
-                        self.__system_devices.append(smoke_device)
-                    else:
-                        generic_device = GenericDevice(
-                            id=device['id'],
-                            name=device['name'],
-                            zone=device['zone_type'],
-                            device_type=device['device_type'],
-                            subtype=device['subtype'],
-                            preenroll=device['preenroll'],
-                            warnings=device['warnings'],
-                            partitions=device['partitions']
-                        )
-                        self.__system_devices.append(generic_device)
+        """ Update all devices in the system with fresh information. The
+        current devices are kept if they can't be fetched. """
+
+        all_devices = self.__api.get_all_devices()
+        if all_devices is None:
+            raise requests.exceptions.RequestException('Failed to get the devices')
+
+        # Build the new devices first so readers never see a partial list
+        devices = [
+            _device_class(device['subtype'])(*_device_fields(device))
+            for device in all_devices
+            if device is not None and device['subtype'] is not None
+        ]
+
+        # Replace all devices since there is no way to uniquely identify them.
+        # The list object is kept so references to it see the new devices.
+        with self.__devices_lock:
+            self.__system_devices[:] = devices
+            self.__device_by_id = {device.id: device for device in devices}
 
 
 class API(object):
@@ -494,10 +588,45 @@ class API(object):
     __user_token = None # Used in version 8.0
 
     # Use a session to reuse one TCP connection instead of creating a new
-    # connection for every call to the API
+    # connection for every call to the API. The session is shared by all
+    # instances using the same hostname.
     __session = None
     __system_devices = []
 
+    # Headers added to the session defaults when sending a request
+    __headers = None
+    __post_headers = None
+
+    # Connect and read timeouts in seconds, so a request never hangs forever
+    __timeout = (3.05, 15)
+
+    # Encoded set_state payloads, only the -1 partition is supported
+    __arm_home_json = b'{"partition":-1,"state":"HOME"}'
+    __arm_away_json = b'{"partition":-1,"state":"AWAY"}'
+    __disarm_json = b'{"partition":-1,"state":"DISARM"}'
+
+    # Cache of GET responses keyed by URL and the number of seconds a
+    # cached response is considered fresh for each URL. Only URLs with a
+    # TTL are cached, and at most __cache_max_entries of them. Responses
+    # are stored encoded so every caller gets its own copy.
+    __cache = None
+    __cache_ttl = None
+    __cache_max_entries = 16
+
+    # A cached response older than this many TTLs is not used as a fallback
+    # when a request fails
+    __cache_fallback_factor = 5
+
+    # URLs that never fall back on the cache. The status and the alarms
+    # together make up the alarm state, which must not be built from stale
+    # data while the server can't be reached.
+    __cache_no_fallback = frozenset()
+
+    # Time of the last successful request, the tokens are considered valid
+    # for __logged_in_ttl seconds after it without probing the server
+    __last_ok_ts = 0.0
+    __logged_in_ttl = 30.0
+
     def __init__(self, hostname, app_id, user_code, user_email, user_password, panel_id, partition):
         """ Class constructor initializes all URL variables. """
 
@@ -510,83 +639,84 @@ class API(object):
         self.__user_email = user_email
         self.__user_password = user_password
 
-        self.__url_version = 'https://' + self.__hostname + '/rest_api/version'
-        
-        # Create a new session
-        self.__session = requests.session()
-
-    def __send_get_request(self, url, with_user_token, with_session_token):
-        """ Send a GET request to the server. Includes the Session-Token
-        only if with_session_token is True. """
-
-        # Prepare the headers to be sent
-        headers = {
-            'Host': self.__hostname,
-            'Connection': 'keep-alive',
-            'Accept': '*/*',
-            'User-Agent': self.__user_agent,
-            'Accept-Language': 'en-us',
-            'Accept-Encoding': 'br, gzip, deflate'
-        }
+        self.__url_version = f'https://{self.__hostname}/rest_api/version'
+
+        # Use the session shared with other instances talking to the same server
+        self.__session = _get_session(self.__hostname, self.__user_agent)
+
+        # Headers sent with every request, the tokens are added when logging in
+        self.__headers = {}
+        self.__post_headers = {'Content-Type': 'application/json'}
+
+        # Create an empty response cache, least recently used first
+        self.__cache = OrderedDict()
+        self.__cache_lock = threading.Lock()
+        self.__cache_ttl = {}
+
+    def __send_get_request(self, url, list_items=False):
+        """ Send a GET request to the server. Responses are served from
+        the cache as long as they are fresh. If list_items is True the
+        response is a list, and with ijson its items are parsed while the
+        body is being received so the raw body is never held in memory. """
 
-        # Include the session token in the header
-        if with_session_token:
-            headers['Session-Token'] = self.__session_token
+        # Return the cached response if it is still fresh
+        entry = self.__get_cached(url)
+        if entry is not None and time.monotonic() - entry[0] < self.__cache_ttl.get(url, 0):
+            logging.debug('=== CACHED RESPONSE -> ' + url + ' ===')
+            return _json_loads(entry[1])
 
-        # Include the user token in the header
-        if with_user_token:
-            headers['User-Token'] = self.__user_token
+        stream = list_items and ijson is not None
 
         logging.debug('=== GET REQUEST -> ' + url + " ===")
-        logging.debug(headers)
+        logging.debug(self.__headers)
         logging.debug('=== END REQUEST ===')
 
         # Perform the request and log an exception
         # if the response is not OK (HTML 200)
         logging.debug('=== BEGIN RESPONSE ===')
         try:
-            response = self.__session.get(url, headers=headers)
+            response = self.__session.get(url, headers=self.__headers, stream=stream,
+                                          timeout=self.__timeout)
             response.raise_for_status()
-        except requests.exceptions.HTTPError as err:
-            logging.error(err)
-            logging.error(response.content.decode('utf-8'))
+
+            resp = None
+            if response.status_code == requests.codes.ok:
+                if stream:
+                    with response:
+                        # Let urllib3 decompress the body before it is parsed
+                        response.raw.decode_content = True
+                        resp = list(ijson.items(response.raw, 'item', use_float=True))
+                else:
+                    resp = _json_response(response)
+        except _RESPONSE_ERRORS as err:
+            self.__log_request_error(url, err)
+
+            # Fall back on the last known response, if it is recent enough
+            entry = self.__get_fallback(url, err)
+            if entry is not None:
+                logging.debug('=== END RESPONSE (CACHED) ===')
+                return _json_loads(entry[1])
+
+            logging.debug('=== END RESPONSE ===')
+            return None
 
         if response.status_code == requests.codes.ok:
-            resp = json.loads(response.content.decode('utf-8'))
             logging.debug(resp)
 
+            self.__last_ok_ts = time.monotonic()
+            self.__store_cached(url, resp)
+
             logging.debug('=== END RESPONSE ===')
             return resp
         else:
-            logging.error(response.content.decode('utf-8'))
+            logging.error(response.text)
             logging.debug('=== END RESPONSE ===')
 
-    def __send_post_request(self, url, data_json, with_user_token, with_session_token):
-        """ Send a POST request to the server. Includes the Session-Token
-        only if with_session_token is True. """
-
-        # Prepare the headers to be sent
-        headers = {
-            'Host': self.__hostname,
-            'Content-Type': 'application/json',
-            'Connection': 'keep-alive',
-            'Accept': '*/*',
-            'User-Agent': self.__user_agent,
-            'Content-Length': str(len(data_json)),
-            'Accept-Language': 'en-us',
-            'Accept-Encoding': 'br, gzip, deflate'
-        }
-
-        # Include the session token in the header
-        if with_session_token:
-            headers['Session-Token'] = self.__session_token
-
-        # Include the user token in the header
-        if with_user_token:
-            headers['User-Token'] = self.__user_token
+    def __send_post_request(self, url, data_json):
+        """ Send a POST request to the server. """
 
         logging.debug('=== POST REQUEST -> ' + url + " ===")
-        logging.debug(headers)
+        logging.debug(self.__post_headers)
         logging.debug(data_json)
         logging.debug('=== END REQUEST ===')
         
@@ -594,23 +724,94 @@ class API(object):
         # if the response is not OK (HTML 200)
         logging.debug('=== BEGIN RESPONSE ===')
         try:
-            response = self.__session.post(url, headers=headers, data=data_json)
+            response = self.__session.post(url, headers=self.__post_headers, data=data_json,
+                                           timeout=self.__timeout)
             response.raise_for_status()
-        except requests.exceptions.HTTPError as err:
-            logging.error(err)
-            logging.error(response.content.decode('utf-8'))
+
+            resp = None
+            if response.status_code == requests.codes.ok:
+                resp = _json_response(response)
+        except _RESPONSE_ERRORS as err:
+            self.__log_request_error(url, err)
+            logging.debug('=== END RESPONSE ===')
+            return None
 
         # Check HTTP response code
         if response.status_code == requests.codes.ok:
-            resp = json.loads(response.content.decode('utf-8'))
             logging.debug(resp)
+            self.__last_ok_ts = time.monotonic()
             logging.debug('=== END RESPONSE ===')
             return resp
         else:
-            logging.error(response.content.decode('utf-8'))
+            logging.error(response.text)
             logging.debug('=== END RESPONSE ===')
             return None
 
+    def __log_request_error(self, url, err):
+        """ Log a failed request, with the response body if there is one. """
+        logging.error('%s %s', url, err)
+        response = getattr(err, 'response', None)
+        if response is not None:
+            logging.error(response.text)
+
+    def __set_token_header(self, name, token):
+        """ Send token in the name header with every following request. """
+        self.__headers[name] = token
+        self.__post_headers[name] = token
+
+    def __get_cached(self, url):
+        """ Get the (timestamp, encoded response) cache entry of url, if any. """
+        with self.__cache_lock:
+            entry = self.__cache.get(url)
+            if entry is not None:
+                self.__cache.move_to_end(url)
+            return entry
+
+    def __get_fallback(self, url, err):
+        """ Get the cache entry of url to use after the request failed with
+        err. Stale entries are not used, and neither is any entry of the
+        status and the alarms or when the tokens were rejected, since the
+        cached state can't be trusted then. """
+        if url in self.__cache_no_fallback:
+            return None
+
+        response = getattr(err, 'response', None)
+        if response is not None and response.status_code in (401, 403):
+            self.__invalidate_cache(url)
+            return None
+
+        entry = self.__get_cached(url)
+        max_age = self.__cache_ttl.get(url, 0) * self.__cache_fallback_factor
+        if entry is not None and time.monotonic() - entry[0] < max_age:
+            return entry
+        return None
+
+    def __store_cached(self, url, resp):
+        """ Cache the response of url if the URL has a TTL, evicting the
+        least recently used entries when the cache is full. """
+        if url not in self.__cache_ttl:
+            return
+
+        with self.__cache_lock:
+            self.__cache[url] = (time.monotonic(), _json_dumps(resp))
+            self.__cache.move_to_end(url)
+            while len(self.__cache) > self.__cache_max_entries:
+                self.__cache.popitem(last=False)
+
+    def __invalidate_cache(self, *urls):
+        """ Drop the cached responses of the given URLs. """
+        with self.__cache_lock:
+            for url in urls:
+                self.__cache.pop(url, None)
+
+    def __set_state(self, state_json):
+        """ Send a new state to the alarm system. """
+        res = self.__send_post_request(self.__url_set_state, state_json)
+
+        # The state has changed, make sure it is fetched again
+        self.__invalidate_cache(self.__url_status, self.__url_alarms)
+        return res
+
     ######################
     # Public API methods #
     ######################
@@ -652,31 +853,40 @@ class API(object):
 
     def get_version_info(self):
         """ Find out which REST API versions are supported. """
-        return self.__send_get_request(self.__url_version,
-                                       with_user_token=False,
-                                       with_session_token=False)
+        return self.__send_get_request(self.__url_version)
 
     def setVersionUrls(self, version):
         self.__rest_version = version
 
-         # Visonic API URLs that should be used
-        self.__url_base = 'https://' + self.__hostname + '/rest_api/' + \
-                          self.__rest_version
-
-        self.__url_panel_login = self.__url_base + '/panel/login'
-        self.__url_login = self.__url_base + '/auth'
-        self.__url_status = self.__url_base + '/status'
-        self.__url_alarms = self.__url_base + '/alarms'
-        self.__url_alerts = self.__url_base + '/alerts'
-        self.__url_troubles = self.__url_base + '/troubles'
-
-        self.__url_panel_info = self.__url_base + '/panel_info'
-        self.__url_events = self.__url_base + '/events'
-        self.__url_wakeup_sms = self.__url_base + '/wakeup_sms'
-        self.__url_all_devices = self.__url_base + '/devices'
-        self.__url_set_state = self.__url_base + '/set_state'
-        self.__url_locations = self.__url_base + '/locations'
-        self.__url_process_status = self.__url_base + '/process_status'
+        # Visonic API URLs that should be used
+        base = f'https://{self.__hostname}/rest_api/{self.__rest_version}'
+        self.__url_base = base
+
+        self.__url_panel_login = f'{base}/panel/login'
+        self.__url_login = f'{base}/auth'
+        self.__url_status = f'{base}/status'
+        self.__url_alarms = f'{base}/alarms'
+        self.__url_alerts = f'{base}/alerts'
+        self.__url_troubles = f'{base}/troubles'
+
+        self.__url_panel_info = f'{base}/panel_info'
+        self.__url_events = f'{base}/events'
+        self.__url_wakeup_sms = f'{base}/wakeup_sms'
+        self.__url_all_devices = f'{base}/devices'
+        self.__url_set_state = f'{base}/set_state'
+        self.__url_locations = f'{base}/locations'
+        self.__url_process_status = f'{base}/process_status'
+
+        # Number of seconds a response is cached, URLs not listed are
+        # never served from the cache.
+        self.__cache_ttl = {
+            self.__url_status: 2.0,
+            self.__url_panel_info: 60.0,
+            self.__url_all_devices: 30.0,
+            self.__url_events: 5.0
+        }
+        self.__cache_no_fallback = frozenset([self.__url_status, self.__url_alarms])
+        self.__cache.clear()
 
     def login(self):
         """ Try to login and get a user token. """
@@ -687,12 +897,13 @@ class API(object):
             'app_id': self.__app_id
         }
 
-        login_json = json.dumps(login_info, separators=(',', ':'))
-        res = self.__send_post_request(self.__url_login, login_json,
-                                       with_user_token=False,
-                                       with_session_token=False)
+        login_json = _json_dumps(login_info)
+        res = self.__send_post_request(self.__url_login, login_json)
+        if res is None:
+            raise requests.exceptions.RequestException('Login failed, no user token received')
 
         self.__user_token = res['user_token']
+        self.__set_token_header('User-Token', self.__user_token)
 
     def panel_login(self):
         """ Try to panel login and get a session token. """
@@ -705,119 +916,80 @@ class API(object):
             'panel_serial': self.__panel_id
         }
         
-        panel_login_json = json.dumps(panel_login_info, separators=(',', ':'))
-        res = self.__send_post_request(self.__url_panel_login, panel_login_json,
-                                        with_user_token=True,
-                                        with_session_token=False)
-        
+        panel_login_json = _json_dumps(panel_login_info)
+        res = self.__send_post_request(self.__url_panel_login, panel_login_json)
+        if res is None:
+            raise requests.exceptions.RequestException('Panel login failed, no session token received')
+
         self.__session_token = res['session_token']
+        self.__set_token_header('Session-Token', self.__session_token)
 
     def is_logged_in(self):
-        """ Check if the session token is still valid. """
-        try:
-            self.get_status()
+        """ Check if the session token is still valid. A request that
+        succeeded recently is proof enough, otherwise probe the server. """
+        if self.__session_token and time.monotonic() - self.__last_ok_ts < self.__logged_in_ttl:
             return True
-        except requests.HTTPError:
-            return False
+
+        # Failed requests are not raised, only a request that succeeded
+        # after the probe started counts. A cached fallback does not.
+        probe_ts = time.monotonic()
+        self.get_status()
+        return self.__last_ok_ts >= probe_ts
 
     def get_status(self):
         """ Get the current status of the alarm system. """
-        return self.__send_get_request(self.__url_status,
-                                       with_user_token=True,
-                                       with_session_token=True)
+        return self.__send_get_request(self.__url_status)
 
     def get_alarms(self):
         """ Get the current alarms. """
 
-        return self.__send_get_request(self.__url_alarms,
-                                       with_user_token=True,
-                                       with_session_token=True)
+        return self.__send_get_request(self.__url_alarms)
 
     def get_troubles(self):
         """ Get the current troubles. """
 
-        return self.__send_get_request(self.__url_troubles,
-                                       with_user_token=True,
-                                       with_session_token=True)
+        return self.__send_get_request(self.__url_troubles)
 
     def get_alerts(self):
         """ Get the current alerts. """
 
-        return self.__send_get_request(self.__url_alerts,
-                                       with_user_token=True,
-                                       with_session_token=True)
+        return self.__send_get_request(self.__url_alerts)
 
     def get_panel_info(self):
         """ Get the panel information. """
-        return self.__send_get_request(self.__url_panel_info,
-                                       with_user_token=True,
-                                       with_session_token=True)
+        return self.__send_get_request(self.__url_panel_info)
 
     def get_events(self):
         """ Get the alarm panel events. """
-        return self.__send_get_request(self.__url_events,
-                                       with_user_token=True,
-                                       with_session_token=True)
+        return self.__send_get_request(self.__url_events, list_items=True)
 
     def get_wakeup_sms(self):
         """ Get the information needed to send a
         wakeup SMS to the alarm system. """
-        return self.__send_get_request(self.__url_wakeup_sms,
-                                       with_user_token=True,
-                                       with_session_token=True)
+        return self.__send_get_request(self.__url_wakeup_sms)
 
     def get_all_devices(self):
         """ Get the device specific information. """
 
-        return self.__send_get_request(self.__url_all_devices,
-                                       with_user_token=True,
-                                       with_session_token=True)
+        return self.__send_get_request(self.__url_all_devices, list_items=True)
 
     def get_locations(self):
         """ Get all locations in the alarm system. """
-        return self.__send_get_request(self.__url_locations,
-                                       with_user_token=True,
-                                       with_session_token=True)
+        return self.__send_get_request(self.__url_locations)
 
     def arm_home(self, partition):
         """ Arm in Home mode and with Exit Delay. """
-        arm_info = {
-            'partition': -1,
-            'state': "HOME"
-        }
-        arm_json = json.dumps(arm_info, separators=(',', ':'))
-
-        return self.__send_post_request(self.__url_set_state, arm_json,
-                                       with_user_token=True,
-                                       with_session_token=True)
+        return self.__set_state(self.__arm_home_json)
 
     def get_process_status(self, token):
-        res = self.__send_get_request(self.__url_process_status + '?process_tokens=' + token,
-                                       with_user_token=True,
-                                       with_session_token=True)
+        res = self.__send_get_request(f'{self.__url_process_status}?process_tokens={token}')
 
         return res[0]
 
     def arm_away(self, partition):
         """ Arm in Away mode and with Exit Delay. """
-        arm_info = {
-            'partition': -1,
-            'state': "AWAY"
-        }
-        arm_json = json.dumps(arm_info, separators=(',', ':'))
-
-        return self.__send_post_request(self.__url_set_state, arm_json,
-                                        with_user_token=True,
-                                        with_session_token=True)
+        return self.__set_state(self.__arm_away_json)
 
     def disarm(self, partition):
         """ Disarm the alarm system. """
-        disarm_info = {
-            'partition': -1,
-            'state': "DISARM"
-        }
-        disarm_json = json.dumps(disarm_info, separators=(',', ':'))
-
-        return self.__send_post_request(self.__url_set_state, disarm_json,
-                                        with_user_token=True,
-                                        with_session_token=True)
\ No newline at end of file
+        return self.__set_state(self.__disarm_json)